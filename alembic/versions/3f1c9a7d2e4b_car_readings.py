@@ -0,0 +1,58 @@
+"""car readings
+
+Revision ID: 3f1c9a7d2e4b
+Revises: b6e556f6f616
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2e4b'
+down_revision: Union[str, None] = 'b6e556f6f616'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'car_readings',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('road_id', sa.Uuid(), nullable=False),
+        sa.Column('plate_number', sa.String(length=16), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('average_speed', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'recorded_at'),
+        postgresql_partition_by='RANGE (recorded_at)',
+    )
+    op.create_index(
+        'ix_car_readings_recorded_at_brin', 'car_readings', ['recorded_at'], postgresql_using='brin'
+    )
+    op.create_index('ix_car_readings_road_id_recorded_at', 'car_readings', ['road_id', 'recorded_at'])
+    # daily partitions from here on are created by src.telemetry.services.maintain_partitions
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            day date;
+        BEGIN
+            FOR day IN SELECT generate_series(current_date, current_date + 3, interval '1 day')::date LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF car_readings FOR VALUES FROM (%L) TO (%L)',
+                    'car_readings_p' || to_char(day, 'YYYYMMDD'),
+                    to_char(day, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(day + 1, 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('car_readings')
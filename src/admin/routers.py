@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+
+from src.config import get_settings, reload_settings
+from src.services.limiter import ingest_limiters
+from src.services.profiling import ProfiledRoute, capture_loop_profile
+
+
+def allowed_host(request: Request):
+    """Admin endpoints are only served to PROFILE_ALLOWED_HOSTS."""
+    if request.client is None or request.client.host not in get_settings().PROFILE_ALLOWED_HOSTS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is not allowed from this host")
+
+
+admin = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(allowed_host)],
+)
+
+
+@admin.get(
+    "/ingest-limits",
+    status_code=status.HTTP_200_OK,
+)
+async def ingest_limits():
+    return {topic.value: limiter.metrics() for topic, limiter in ingest_limiters.items()}
+
+
+@admin.post(
+    "/reload-settings",
+    status_code=status.HTTP_200_OK,
+)
+async def reload():
+    """Reload tuning settings in this worker; send SIGHUP to reach every worker."""
+    return {"applied": reload_settings()}
+
+
+@admin.post(
+    "/profile",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+)
+async def profile_event_loop(
+    seconds: float = Query(10.0, gt=0),
+    interval: float = Query(0.005, ge=0.001, le=1.0),
+):
+    """Sample the event loop for ``seconds`` and return folded stacks for flamegraph.pl or speedscope."""
+    config = get_settings()
+    if seconds > config.PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must not exceed {config.PROFILE_MAX_SECONDS}",
+        )
+
+    folded = await capture_loop_profile(seconds, interval)
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": 'attachment; filename="event-loop.folded"'},
+    )
@@ -1,30 +1,149 @@
-from pydantic_settings import BaseSettings
+from collections.abc import Callable
+from functools import cached_property
+from typing import Any
+
+from loguru import logger
+from pydantic import ImportString
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    """Immutable settings snapshot read from the environment and ``.env``."""
+
+    model_config = SettingsConfigDict(frozen=True, env_file=".env")
+
     PG_HOST: str = "postgres"
     PG_PORT: str = "5432"
     PG_NAME: str = "dip_1"
     PG_USER: str = "postgres"
     PG_PASS: str = "avdeev97"
+    PG_POOL_SIZE: int = 0
+    PG_MAX_OVERFLOW: int = 10
+    PG_POOL_TIMEOUT: float = 30.0
+    PG_POOL_RECYCLE: int = -1
+    PG_REPLICA_URLS: list[str] = []
+    PG_REPLICA_STICKY_SECONDS: float = 5.0
+    PG_REPLICA_HEALTH_INTERVAL: float = 10.0
+    PG_SHARDS: dict[str, str] = {}
+    PG_SHARDS_PREVIOUS: dict[str, str] = {}
+    PG_SHARD_VNODES: int = 64
 
     KAFKA_BOOTSTRAP_SERVERS: str = "kafka:9092"
     KAFKA_CONSUME_TOPICS: list[str] = ["RoadCondition"]
     SEND_TOPICS: list[str] = ["RoadCondition"]
     GROUP_ID: str = "as"
+    KAFKA_PROVISION_TOPICS: bool = True
+    KAFKA_REPLICATION_FACTOR: int = 1
+    KAFKA_TOPIC_PARTITIONS: dict[str, int] = {"Car": 12, "Road": 3, "RoadCondition": 6}
+    KAFKA_TOPIC_KEYS: dict[str, str] = {"Car": "road_id", "RoadCondition": "road_id"}
+    KAFKA_PARTITIONER: ImportString[Callable] | None = None
+    KAFKA_LINGER_MS: int = 0
+    KAFKA_MAX_BATCH_SIZE: int = 16 * 1024
+    KAFKA_PUBLISH_TIMEOUT: float = 10.0
 
     REDIS_HOST: str = "redis"
     REDIS_PORT: str = "6379"
 
     ECHO: bool = False
+    LOG_SAMPLE_RATE: float = 1.0
+
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_ALLOWED_HOSTS: list[str] = ["127.0.0.1"]
+    PROFILE_MAX_SECONDS: float = 60.0
+    PROFILE_SLOW_CALLBACK_MS: float = 0.0
+
+    TELEMETRY_BATCH_SIZE: int = 1000
+    TELEMETRY_PARTITION_DAYS_AHEAD: int = 3
+    TELEMETRY_RETENTION_DAYS: int = 30
+    TELEMETRY_MAINTENANCE_INTERVAL: float = 60 * 60
+
+    JOBS_MAX_RUNNING: int = 4
+    JOBS_MAX_PENDING: int = 100
+    JOBS_PERSIST: bool = False
+    JOBS_TTL: int = 24 * 60 * 60
 
-    @property
+    INGEST_INITIAL_LIMIT: int = 20
+    INGEST_MIN_LIMIT: int = 1
+    INGEST_MAX_LIMIT: int = 200
+    INGEST_MAX_QUEUE: int = 100
+    INGEST_QUEUE_TIMEOUT: float = 2.0
+    INGEST_LATENCY_TARGET: float = 0.5
+
+    @cached_property
     def db_url_postgresql(self) -> str:
         return f"postgresql+asyncpg://{self.PG_USER}:{self.PG_PASS}@{self.PG_HOST}:{self.PG_PORT}/{self.PG_NAME}"
 
-    @property
+    @cached_property
     def db_url_redis(self) -> str:
         return f"redis://@{self.REDIS_HOST}:{self.REDIS_PORT}/"
 
 
+# tuning knobs that reload_settings applies to a running process, everything
+# else (addresses, topics, subscriber setup) needs a restart
+RELOADABLE = frozenset(
+    {
+        "PG_POOL_SIZE",
+        "PG_MAX_OVERFLOW",
+        "PG_POOL_TIMEOUT",
+        "PG_POOL_RECYCLE",
+        "PG_REPLICA_STICKY_SECONDS",
+        "PG_REPLICA_HEALTH_INTERVAL",
+        "KAFKA_PUBLISH_TIMEOUT",
+        "ECHO",
+        "LOG_SAMPLE_RATE",
+        "PROFILE_SAMPLE_RATE",
+        "PROFILE_ALLOWED_HOSTS",
+        "PROFILE_MAX_SECONDS",
+        "TELEMETRY_PARTITION_DAYS_AHEAD",
+        "TELEMETRY_RETENTION_DAYS",
+        "TELEMETRY_MAINTENANCE_INTERVAL",
+        "JOBS_MAX_PENDING",
+        "INGEST_MIN_LIMIT",
+        "INGEST_MAX_LIMIT",
+        "INGEST_MAX_QUEUE",
+        "INGEST_QUEUE_TIMEOUT",
+        "INGEST_LATENCY_TARGET",
+    }
+)
+
 settings = Settings()  # pyright: ignore[reportCallIssue]
+
+_reload_hooks: list[Callable[[Settings, set[str]], None]] = []
+
+
+def get_settings() -> Settings:
+    """Current snapshot; ``settings`` imported at module level stays the one from start-up."""
+    return settings
+
+
+def on_reload(hook: Callable[[Settings, set[str]], None]):
+    """Register ``hook(new_settings, changed_fields)`` to run after a reload."""
+    _reload_hooks.append(hook)
+    return hook
+
+
+def reload_settings() -> dict[str, Any]:
+    """Re-read the environment and ``.env`` and apply changed tuning knobs.
+
+    Returns the applied changes; changes to fields outside RELOADABLE are
+    logged and left for the next restart.
+    """
+    global settings
+
+    fresh = Settings()  # pyright: ignore[reportCallIssue]
+    changed = {name for name in Settings.model_fields if getattr(fresh, name) != getattr(settings, name)}
+
+    if skipped := changed - RELOADABLE:
+        logger.warning(f"Settings {sorted(skipped)} changed but need a restart")
+
+    applied = changed & RELOADABLE
+    if not applied:
+        return {}
+
+    settings = settings.model_copy(update={name: getattr(fresh, name) for name in applied})
+    for hook in _reload_hooks:
+        hook(settings, applied)
+
+    logger.info(f"Reloaded settings: {sorted(applied)}")
+    return {name: getattr(settings, name) for name in applied}
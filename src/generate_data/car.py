@@ -1,16 +1,20 @@
 import asyncio
 import random
+import uuid
+from collections.abc import Awaitable, Callable
 
 from src.schemas import CarCreate
-from src.services.kafka import broker
+from src.services.kafka import publish_message
 from src.utils import Topics
 
 max_cars = 50
 
 
-async def publish():
-    for _ in range(max_cars):
-        await broker.publish(generate_car_payload(), topic=Topics.CAR.value)
+async def publish(on_progress: Callable[[float], Awaitable[None]] | None = None):
+    for i in range(max_cars):
+        await publish_message(generate_car_payload(), Topics.CAR)
+        if on_progress is not None:
+            await on_progress((i + 1) / max_cars)
         await asyncio.sleep(1)
 
 
@@ -22,8 +26,9 @@ plate_number = Letter + Figure + Figure + Figure + Letter + Letter + Figure + Fi
 def generate_car_payload():
     body = {
         "plate_number": generate_plate_number(),
+        "road_id": uuid.uuid4(),
         "model": random.choice(["BMW", "Mercedes-Benz", "Lada", "Toyota"]),
-        "avarage_speed": random.randint(0, 50),
+        "average_speed": random.randint(0, 50),
         "latitude": random.uniform(-90.0, 90.0),
         "longitude": random.uniform(-90.0, 90.0),
     }
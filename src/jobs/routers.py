@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from fastapi import APIRouter, status
+
+from src.schemas import JobState
+from src.services.jobs import jobs as job_manager
+from src.services.profiling import ProfiledRoute
+
+jobs = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    route_class=ProfiledRoute,
+)
+
+
+@jobs.get(
+    "/{job_id}",
+    status_code=status.HTTP_200_OK,
+)
+async def get_job(job_id: UUID) -> JobState:
+    return await job_manager.get(job_id)
+
+
+@jobs.post(
+    "/{job_id}/cancel",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def cancel_job(job_id: UUID) -> JobState:
+    return await job_manager.cancel(job_id)
@@ -1,21 +1,46 @@
+import asyncio
+import signal
 from contextlib import asynccontextmanager
 
 from fastapi import APIRouter, FastAPI
 
-from src.services.kafka import broker
+from src.admin.routers import admin as admin_router
+from src.config import reload_settings, settings
+from src.jobs.routers import jobs as jobs_router
+from src.services.common import ReadYourWritesMiddleware, replica_router
+from src.services.jobs import jobs
+from src.services.kafka import broker, provision_topics
+from src.services.profiling import LoopWatchdog, ProfilingMiddleware
 from src.user.routers import user as user_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_settings)
     await broker.connect()
+    if settings.KAFKA_PROVISION_TOPICS:
+        await provision_topics()
+    await replica_router.start()
+    watchdog = None
+    if settings.PROFILE_SLOW_CALLBACK_MS > 0:
+        watchdog = LoopWatchdog(threshold=settings.PROFILE_SLOW_CALLBACK_MS / 1000)
+        await watchdog.start()
     yield
+    if watchdog is not None:
+        await watchdog.close()
+    await replica_router.close()
+    await jobs.close()
     await broker.close()
+    asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 v1_router = APIRouter(prefix="/api/v1")
 
 v1_router.include_router(user_router)
+v1_router.include_router(admin_router)
+v1_router.include_router(jobs_router)
 app.include_router(v1_router)
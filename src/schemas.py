@@ -1,8 +1,10 @@
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from src.utils import Jam, UserRole, Weather
+from src.utils import Jam, JobStatus, UserRole, Weather
 
 
 class FromAttr(BaseModel):
@@ -29,6 +31,15 @@ class ReturnUser(UserBase):
     id: UUID
 
 
+class UserOut(FromAttr):
+    id: UUID
+    login: str
+    username: str
+    role: UserRole
+    is_active: bool
+    is_superuser: bool
+
+
 class GetUser(FromAttr):
     id: UUID
 
@@ -62,3 +73,15 @@ class RoadCreate(FromAttr):
     name: str = Field(..., min_length=1, max_length=100)
     street: str = Field(..., min_length=1, max_length=255)
     description: str = Field(..., min_length=1, max_length=400)
+
+
+class JobState(BaseModel):
+    id: UUID
+    name: str
+    status: JobStatus = JobStatus.PENDING
+    progress: float = Field(default=0.0, ge=0, le=1)
+    result: Any = None
+    error: str | None = None
+    cancel_requested: bool = False
+    created_at: datetime
+    updated_at: datetime
@@ -1,6 +1,11 @@
+import asyncio
+import math
 import re
+import time
 import typing
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from contextvars import ContextVar
 from datetime import UTC, datetime
 from enum import Enum
 from types import TracebackType
@@ -22,17 +27,22 @@ from sqlalchemy import (
     delete,
     insert,
     select,
+    text,
     update,
 )
-from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from sqlalchemy.exc import NoResultFound, OperationalError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.config import settings
+from src.config import Settings, get_settings, on_reload, settings
+from src.services.profiling import span
 from src.user.models import Base
 
 M = TypeVar("M", bound=Base)
@@ -55,6 +65,17 @@ class Singleton:  # pragma: no cover
 
 
 class DatabaseConfig(Singleton):
+    """Engines and session makers, built once per database url.
+
+    ``PG_POOL_SIZE=0`` keeps the NullPool; a positive size switches to a
+    queue pool with the other ``PG_POOL_*`` knobs.
+    """
+
+    def init(self, *args: typing.Any, **kwds: typing.Any):
+        self._engines: dict[str, AsyncEngine] = {}
+        self._session_makers: dict[str, async_sessionmaker[AsyncSession]] = {}
+        self._disposing: set[asyncio.Task] = set()
+
     def __init__(
         self,
         db_url_postgresql: str,
@@ -62,18 +83,214 @@ class DatabaseConfig(Singleton):
         self.db_url_postgresql = db_url_postgresql
 
     @property
-    def engine(self):
-        return create_async_engine(self.db_url_postgresql, echo=settings.ECHO, poolclass=NullPool)
+    def engine(self) -> AsyncEngine:
+        engine = self._engines.get(self.db_url_postgresql)
+        if engine is None:
+            engine = self._engines[self.db_url_postgresql] = self._create_engine(self.db_url_postgresql, get_settings())
+        return engine
 
     @property
-    def async_session_maker(self):
-        return async_sessionmaker(
-            self.engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
+    def async_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        session_maker = self._session_makers.get(self.db_url_postgresql)
+        if session_maker is None:
+            session_maker = self._session_makers[self.db_url_postgresql] = async_sessionmaker(
+                self.engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
+        return session_maker
+
+    def rebuild(self, new_settings: Settings):
+        """Swap every engine for one built from ``new_settings``.
+
+        Disposing the old engine closes its idle connections; sessions
+        already open keep their checked out connection until they finish.
+        """
+        old_engines = list(self._engines.values())
+        for url in list(self._engines):
+            self._engines[url] = self._create_engine(url, new_settings)
+            self._session_makers.pop(url, None)
+
+        for engine in old_engines:
+            task = asyncio.get_running_loop().create_task(engine.dispose())
+            self._disposing.add(task)
+            task.add_done_callback(self._disposing.discard)
+
+    @staticmethod
+    def _create_engine(db_url: str, config: Settings) -> AsyncEngine:
+        if config.PG_POOL_SIZE <= 0:
+            return create_async_engine(db_url, echo=config.ECHO, poolclass=NullPool)
+        return create_async_engine(
+            db_url,
+            echo=config.ECHO,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=config.PG_POOL_SIZE,
+            max_overflow=config.PG_MAX_OVERFLOW,
+            pool_timeout=config.PG_POOL_TIMEOUT,
+            pool_recycle=config.PG_POOL_RECYCLE,
+            pool_pre_ping=True,
         )
 
 
+POOL_SETTINGS = {"ECHO", "PG_POOL_SIZE", "PG_MAX_OVERFLOW", "PG_POOL_TIMEOUT", "PG_POOL_RECYCLE"}
+
+
+class Replica:
+    def __init__(self, db_url: str) -> None:
+        self.db_url = db_url
+        self.healthy = True
+        self.connections = 0
+
+    @property
+    def session_maker(self) -> async_sessionmaker[AsyncSession]:
+        return DatabaseConfig(self.db_url).async_session_maker
+
+    async def check(self, timeout: float):
+        try:
+            async with self.session_maker() as session:
+                await asyncio.wait_for(session.execute(text("SELECT 1")), timeout=timeout)
+        except Exception as exc:
+            if self.healthy:
+                logger.warning(f"Replica {self.db_url!r} is unhealthy: {exc!r}")
+            self.healthy = False
+        else:
+            if not self.healthy:
+                logger.info(f"Replica {self.db_url!r} is healthy again")
+            self.healthy = True
+
+
+LAST_WRITE_COOKIE = "last_write"
+
+
+class WriteSession:
+    """When the client of the current request last wrote, as a unix timestamp."""
+
+    def __init__(self, last_write: float | None) -> None:
+        self.last_write = last_write
+        self.wrote = False
+
+
+_write_session: ContextVar[WriteSession | None] = ContextVar("write_session", default=None)
+
+
+class ReadYourWritesMiddleware:
+    """Carries the client's last write time in a cookie, so whichever worker
+    serves its next request keeps reading from the primary."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        session = WriteSession(self._last_write(HTTPConnection(scope).cookies.get(LAST_WRITE_COOKIE)))
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start" and session.wrote and session.last_write is not None:
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={session.last_write:.3f}; "
+                    f"Max-Age={math.ceil(replica_router.sticky_seconds)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        token = _write_session.set(session)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _write_session.reset(token)
+
+    @staticmethod
+    def _last_write(raw: str | None) -> float | None:
+        try:
+            last_write = float(raw) if raw is not None else None
+        except ValueError:
+            return None
+        # a timestamp from the future would pin the client to the primary
+        return last_write if last_write is not None and last_write <= time.time() else None
+
+
+class ReplicaRouter:
+    """Picks a replica for read-only units of work.
+
+    Healthy replicas are balanced by the number of open units of work.
+    A client that wrote within ``sticky_seconds`` keeps reading from the
+    primary so it sees its own writes. Writes are remembered per process
+    by ``client_id`` and, for requests going through
+    ``ReadYourWritesMiddleware``, in a cookie that every worker reads.
+    """
+
+    def __init__(self, replica_urls: list[str], sticky_seconds: float, health_interval: float) -> None:
+        self.replicas = [Replica(url) for url in replica_urls]
+        self.sticky_seconds = sticky_seconds
+        self.health_interval = health_interval
+        self._writes: dict[str, float] = {}
+        self._health_task: asyncio.Task | None = None
+
+    def choose(self, client_id: str | None = None) -> Replica | None:
+        session = _write_session.get()
+        if session is not None and session.last_write is not None:
+            if time.time() - session.last_write < self.sticky_seconds:
+                return None
+
+        if client_id is not None and client_id in self._writes:
+            if time.monotonic() - self._writes[client_id] < self.sticky_seconds:
+                return None
+            del self._writes[client_id]
+
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        return min(healthy, key=lambda replica: replica.connections, default=None)
+
+    def mark_write(self, client_id: str | None):
+        session = _write_session.get()
+        if session is not None:
+            session.last_write = time.time()
+            session.wrote = True
+
+        if client_id is None:
+            return
+        now = time.monotonic()
+        if len(self._writes) > 10_000:
+            self._writes = {k: v for k, v in self._writes.items() if now - v < self.sticky_seconds}
+        self._writes[client_id] = now
+
+    async def check(self):
+        await asyncio.gather(*(replica.check(timeout=self.health_interval) for replica in self.replicas))
+
+    async def start(self):
+        if not self.replicas:
+            return
+        await self.check()
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check()
+
+
+replica_router = ReplicaRouter(
+    settings.PG_REPLICA_URLS,
+    sticky_seconds=settings.PG_REPLICA_STICKY_SECONDS,
+    health_interval=settings.PG_REPLICA_HEALTH_INTERVAL,
+)
+
+
+@on_reload
+def apply_database_settings(new_settings: Settings, changed: set[str]):
+    replica_router.sticky_seconds = new_settings.PG_REPLICA_STICKY_SECONDS
+    replica_router.health_interval = new_settings.PG_REPLICA_HEALTH_INTERVAL
+    if changed & POOL_SETTINGS:
+        DatabaseConfig(new_settings.db_url_postgresql).rebuild(new_settings)
+
+
 class IUnitOfWorkBase(ABC):
     async def __aenter__(self):
         return self
@@ -95,13 +312,36 @@ class IUnitOfWorkBase(ABC):
 
 
 class PgUnitOfWork(IUnitOfWorkBase):
-    def __init__(self, db_url_postgresql: str) -> None:
+    """Unit of work on the primary, or on a replica when ``read_only`` is set.
+
+    ``client_id`` identifies the caller for read-your-writes: after it
+    commits a write, its read-only units of work stay on the primary for
+    ``PG_REPLICA_STICKY_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        db_url_postgresql: str,
+        read_only: bool = False,
+        client_id: str | None = None,
+        router: ReplicaRouter = replica_router,
+    ) -> None:
         self.db_url_postgresql = db_url_postgresql
-        self._session_factory = DatabaseConfig(db_url_postgresql).async_session_maker
+        self.read_only = read_only
+        self.client_id = client_id
+        self._router = router
+        self._replica: Replica | None = None
         self._async_session: AsyncSession
 
     async def __aenter__(self):
-        self._async_session = self._session_factory()
+        if self.read_only:
+            self._replica = self._router.choose(self.client_id)
+
+        if self._replica is not None:
+            self._replica.connections += 1
+            self._async_session = self._replica.session_maker()
+        else:
+            self._async_session = DatabaseConfig(self.db_url_postgresql).async_session_maker()
         return self
 
     async def __aexit__(
@@ -114,6 +354,10 @@ class PgUnitOfWork(IUnitOfWorkBase):
             await self.rollback()
 
         await self.close()
+        if self._replica is not None:
+            self._replica.connections -= 1
+            if isinstance(exc_val, OperationalError):
+                self._replica.healthy = False
         if isinstance(exc_val, HTTPException):
             raise exc_val
         else:
@@ -133,28 +377,50 @@ class PgUnitOfWork(IUnitOfWorkBase):
     async def commit(self):
         if self._async_session is None:
             raise NotCreatedSessionError
-        await self._async_session.commit()
+        with span("db"):
+            await self._async_session.commit()
+        if not self.read_only:
+            self._router.mark_write(self.client_id)
 
     async def flush(self):
         if self._async_session is None:
             raise NotCreatedSessionError
-        await self._async_session.flush()
+        with span("db"):
+            await self._async_session.flush()
 
     async def refresh(self, instance: type[M]):
         if self._async_session is None:
             raise NotCreatedSessionError
-        await self._async_session.refresh(instance)
+        with span("db"):
+            await self._async_session.refresh(instance)
 
     async def execute(self, statement: Executable, *args: Any):
         if self._async_session is None:
             raise NotCreatedSessionError
-        return await self._async_session.execute(statement, *args)
+        with span("db"):
+            return await self._async_session.execute(statement, *args)
 
     def add(self, instance: object):
         if self._async_session is None:
             raise NotCreatedSessionError
         self._async_session.add(instance)
 
+    async def copy_records(self, table_name: str, records: list[tuple], columns: Sequence[str]):
+        """Bulk load ``records`` with asyncpg's binary COPY inside this unit of work."""
+        if self._async_session is None:
+            raise NotCreatedSessionError
+        with span("db"):
+            connection = await self._async_session.connection()
+            # the asyncpg adapter opens its transaction lazily on the first statement,
+            # without this COPY would autocommit outside of commit()/rollback()
+            await connection.exec_driver_sql("SELECT 1")
+            raw = await connection.get_raw_connection()
+            return await raw.driver_connection.copy_records_to_table(  # pyright: ignore[reportOptionalMemberAccess]
+                table_name,
+                records=records,
+                columns=columns,
+            )
+
 
 class Query:
     def __init__(self, model: type[M]) -> None:
@@ -0,0 +1,224 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from loguru import logger
+from redis.asyncio import Redis
+
+from src.config import Settings, on_reload, settings
+from src.schemas import JobState
+from src.utils import JobStatus
+
+FINISHED = {JobStatus.DONE, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class IJobStore(ABC):
+    """Job state storage.
+
+    The cancel flag is kept apart from the state so that a worker saving
+    its own copy of a job never clears a cancel requested by another one.
+    """
+
+    @abstractmethod
+    async def get(self, job_id: UUID) -> JobState | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save(self, state: JobState) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def request_cancel(self, job_id: UUID) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def cancel_requested(self, job_id: UUID) -> bool:
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryJobStore(IJobStore):
+    """Keeps job state in this process, finished jobs are dropped ``ttl`` seconds after they end."""
+
+    def __init__(self, ttl: int) -> None:
+        self._ttl = timedelta(seconds=ttl)
+        self._states: dict[UUID, JobState] = {}
+        self._cancelled: set[UUID] = set()
+        self._finished: OrderedDict[UUID, datetime] = OrderedDict()
+
+    async def get(self, job_id: UUID) -> JobState | None:
+        state = self._states.get(job_id)
+        if state is None:
+            return None
+        return state.model_copy(update={"cancel_requested": job_id in self._cancelled})
+
+    async def save(self, state: JobState) -> None:
+        self._states[state.id] = state.model_copy()
+        if state.status in FINISHED:
+            self._finished[state.id] = state.updated_at
+            self._finished.move_to_end(state.id)
+        self._evict(datetime.now(UTC) - self._ttl)
+
+    async def request_cancel(self, job_id: UUID) -> None:
+        if job_id in self._states:
+            self._cancelled.add(job_id)
+
+    async def cancel_requested(self, job_id: UUID) -> bool:
+        return job_id in self._cancelled
+
+    def _evict(self, before: datetime):
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > before:
+                break
+            del self._finished[job_id]
+            self._states.pop(job_id, None)
+            self._cancelled.discard(job_id)
+
+
+class RedisJobStore(IJobStore):
+    """Keeps job state in Redis so any worker can report on any job."""
+
+    def __init__(self, db_url_redis: str, ttl: int) -> None:
+        self._redis = Redis.from_url(db_url_redis)
+        self._ttl = ttl
+
+    async def get(self, job_id: UUID) -> JobState | None:
+        raw, cancelled = await self._redis.mget(f"job:{job_id}", f"job:{job_id}:cancel")
+        if raw is None:
+            return None
+        return JobState.model_validate_json(raw).model_copy(update={"cancel_requested": cancelled is not None})
+
+    async def save(self, state: JobState) -> None:
+        await self._redis.set(f"job:{state.id}", state.model_dump_json(exclude={"cancel_requested"}), ex=self._ttl)
+
+    async def request_cancel(self, job_id: UUID) -> None:
+        await self._redis.set(f"job:{job_id}:cancel", 1, ex=self._ttl)
+
+    async def cancel_requested(self, job_id: UUID) -> bool:
+        return bool(await self._redis.exists(f"job:{job_id}:cancel"))
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+class Job:
+    """Handle passed to a running job to report progress."""
+
+    def __init__(self, manager: "JobManager", state: JobState) -> None:
+        self.manager = manager
+        self.state = state
+
+    async def set_progress(self, progress: float):
+        if await self.manager.store.cancel_requested(self.state.id):
+            raise asyncio.CancelledError
+        await self.manager.update(self.state, progress=min(max(progress, 0.0), 1.0))
+
+
+class JobManager:
+    """Runs coroutines in the background with at most ``max_running`` at once.
+
+    Jobs beyond that wait for a slot; once ``max_pending`` jobs are waiting
+    new submissions are rejected with 429.
+    """
+
+    def __init__(self, store: IJobStore, max_running: int, max_pending: int) -> None:
+        self.store = store
+        self.max_running = max_running
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_running)
+        self._tasks: dict[UUID, asyncio.Task] = {}
+        self._active = 0
+
+    @property
+    def pending(self) -> int:
+        """Submitted jobs that have no running slot to go to."""
+        return max(0, self._active - self.max_running)
+
+    async def submit(self, name: str, func: Callable[[Job], Awaitable[Any]]) -> JobState:
+        if self.pending >= self.max_pending:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many pending jobs")
+
+        now = datetime.now(UTC)
+        state = JobState(id=uuid4(), name=name, created_at=now, updated_at=now)
+        await self.store.save(state)
+
+        self._active += 1
+        task = asyncio.create_task(self._run(Job(self, state), func), name=f"job-{name}-{state.id}")
+        self._tasks[state.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(state.id, None))
+        return state
+
+    async def get(self, job_id: UUID) -> JobState:
+        state = await self.store.get(job_id)
+        if state is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No such job")
+        return state
+
+    async def cancel(self, job_id: UUID) -> JobState:
+        state = await self.get(job_id)
+        if state.status in FINISHED:
+            return state
+
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        else:
+            # owned by another worker, it checks the flag before it starts and on every progress report
+            await self.store.request_cancel(job_id)
+            state = await self.get(job_id)
+        return state
+
+    async def update(self, state: JobState, **values: Any) -> JobState:
+        for k, v in {**values, "updated_at": datetime.now(UTC)}.items():
+            setattr(state, k, v)
+        await self.store.save(state)
+        return state
+
+    async def close(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        await self.store.close()
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable[Any]]):
+        try:
+            async with self._slots:
+                if await self.store.cancel_requested(job.state.id):
+                    raise asyncio.CancelledError
+                await self.update(job.state, status=JobStatus.RUNNING)
+                result = await func(job)
+        except asyncio.CancelledError:
+            await self.update(job.state, status=JobStatus.CANCELLED)
+        except Exception as exc:
+            logger.exception(f"Job {job.state.name} {job.state.id} failed")
+            await self.update(job.state, status=JobStatus.FAILED, error=repr(exc))
+        else:
+            await self.update(job.state, status=JobStatus.DONE, progress=1.0, result=result)
+        finally:
+            self._active -= 1
+
+
+def make_job_store() -> IJobStore:
+    if settings.JOBS_PERSIST:
+        return RedisJobStore(settings.db_url_redis, ttl=settings.JOBS_TTL)
+    return MemoryJobStore(ttl=settings.JOBS_TTL)
+
+
+jobs = JobManager(
+    store=make_job_store(),
+    max_running=settings.JOBS_MAX_RUNNING,
+    max_pending=settings.JOBS_MAX_PENDING,
+)
+
+
+@on_reload
+def apply_jobs_settings(new_settings: Settings, changed: set[str]):
+    jobs.max_pending = new_settings.JOBS_MAX_PENDING
@@ -1,32 +1,114 @@
+import asyncio
 import json
+import random
 from typing import Any
 
+from aiokafka.admin import AIOKafkaAdminClient, NewPartitions, NewTopic
+from aiokafka.errors import InvalidPartitionsError, TopicAlreadyExistsError, for_code
+from aiokafka.partitioner import DefaultPartitioner
 from faststream import FastStream
 from faststream.kafka import KafkaBroker
 from loguru import logger
+from pydantic import BaseModel
 
-from src.config import settings
+from src.config import get_settings, settings
 from src.schemas import CarCreate, RoadConditionCreate, RoadCreate
+from src.services.limiter import ingest_limiters
+from src.services.profiling import span
 from src.utils import Topics
 
-broker = KafkaBroker(settings.KAFKA_BOOTSTRAP_SERVERS)
+broker = KafkaBroker(
+    settings.KAFKA_BOOTSTRAP_SERVERS,
+    partitioner=settings.KAFKA_PARTITIONER or DefaultPartitioner(),
+    linger_ms=settings.KAFKA_LINGER_MS,
+    max_batch_size=settings.KAFKA_MAX_BATCH_SIZE,
+)
 
 app = FastStream(broker)
 
 
+def message_key(msg: BaseModel, topic: Topics) -> bytes | None:
+    """Partition key for ``msg`` taken from the field configured in KAFKA_TOPIC_KEYS."""
+    field = settings.KAFKA_TOPIC_KEYS.get(topic.value)
+    if field is None:
+        return None
+    value = getattr(msg, field, None)
+    return None if value is None else str(value).encode()
+
+
+async def publish_message(msg: BaseModel, topic: Topics):
+    with span("kafka"):
+        await asyncio.wait_for(
+            broker.publish(msg, topic=topic.value, key=message_key(msg, topic)),
+            timeout=get_settings().KAFKA_PUBLISH_TIMEOUT,
+        )
+
+
+def log_sampled(message: str, *args: Any):
+    """Log a hot-path message for LOG_SAMPLE_RATE of calls, formatting only when kept."""
+    if random.random() < get_settings().LOG_SAMPLE_RATE:
+        logger.info(message, *args)
+
+
 async def publish_car_data(msg: CarCreate):
-    await broker.publish(msg, topic=Topics.CAR.value)
-    logger.info(f"Published car data: {msg}")
+    async with ingest_limiters[Topics.CAR].slot():
+        await publish_message(msg, Topics.CAR)
+    log_sampled("Published car data: {}", msg)
 
 
 async def publish_road_condition_data(msg: RoadConditionCreate):
-    await broker.publish(msg, topic=Topics.ROAD_CONDITION.value)
-    logger.info(f"Published road condition data: {msg}")
+    async with ingest_limiters[Topics.ROAD_CONDITION].slot():
+        await publish_message(msg, Topics.ROAD_CONDITION)
+    log_sampled("Published road condition data: {}", msg)
 
 
 async def publish_road_data(msg: RoadCreate):
-    await broker.publish(msg, topic=Topics.ROAD.value)
-    logger.info(f"Published road data: {msg}")
+    async with ingest_limiters[Topics.ROAD].slot():
+        await publish_message(msg, Topics.ROAD)
+    log_sampled("Published road data: {}", msg)
+
+
+async def provision_topics():
+    """Create missing topics and grow existing ones up to KAFKA_TOPIC_PARTITIONS.
+
+    Kafka can't shrink a topic, so topics that already have more partitions
+    than configured are left as they are.
+    """
+    admin = AIOKafkaAdminClient(bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS)
+    await admin.start()
+    try:
+        wanted = {topic.value: settings.KAFKA_TOPIC_PARTITIONS.get(topic.value, 1) for topic in Topics}
+        existing = {t["topic"]: len(t["partitions"]) for t in await admin.describe_topics(list(wanted))}
+
+        missing = [
+            NewTopic(name, num_partitions=count, replication_factor=settings.KAFKA_REPLICATION_FACTOR)
+            for name, count in wanted.items()
+            if not existing.get(name)
+        ]
+        if missing:
+            response = await admin.create_topics(missing)
+            created = []
+            for topic, code, *message in response.get_item("topic_errors"):
+                error = for_code(code)
+                if code and error is not TopicAlreadyExistsError:
+                    raise error(f"Could not create topic {topic}: {message}")
+                created.append(topic)
+            logger.info(f"Created topics: {created}")
+
+        for name, count in wanted.items():
+            if not existing.get(name) or existing[name] >= count:
+                continue
+            try:
+                await admin.create_partitions({name: NewPartitions(total_count=count)})
+            except InvalidPartitionsError:
+                # another worker may have grown it first
+                current = await admin.describe_topics([name])
+                if len(current[0]["partitions"]) < count:
+                    raise
+            else:
+                logger.info(f"Increased partitions of {name} to {count}")
+    finally:
+        await admin.close()
 
 
 def serializer(value: Any) -> bytes:
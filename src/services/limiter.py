@@ -0,0 +1,173 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+from loguru import logger
+
+from src.config import Settings, on_reload, settings
+from src.utils import Topics
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter with a bounded wait queue.
+
+    The limit grows by ``1 / limit`` for every call that finishes under
+    ``latency_target`` and is multiplied by ``backoff`` when a call is slow
+    or fails. Callers above the limit wait in a queue of ``max_queue``
+    slots; a full queue is rejected with 429 and a queue wait longer than
+    ``queue_timeout`` with 503, both carrying ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        latency_target: float,
+        backoff: float = 0.9,
+    ) -> None:
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+
+        self.inflight = 0
+        self.latency = 0.0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        started = time.monotonic()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.release(time.monotonic() - started, failed=failed)
+
+    async def acquire(self):
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            self._reject(status.HTTP_429_TOO_MANY_REQUESTS)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            granted = waiter.done() and not waiter.cancelled()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                if granted:
+                    return
+                self.shed_timeout += 1
+                self._reject(status.HTTP_503_SERVICE_UNAVAILABLE)
+            if granted:
+                # the slot was handed over right as the caller went away
+                self.inflight -= 1
+                self._wake()
+            raise
+
+    def release(self, elapsed: float, failed: bool = False):
+        self.inflight -= 1
+        self.latency = elapsed if not self.latency else 0.8 * self.latency + 0.2 * elapsed
+
+        if failed or elapsed > self.latency_target:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake()
+
+    def retry_after(self) -> int:
+        """Seconds until the queue in front of a new caller should drain."""
+        pending = len(self._waiters) + self.inflight
+        return max(1, math.ceil(self.latency * pending / max(self.limit, 1)))
+
+    def configure(
+        self,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        queue_timeout: float,
+        latency_target: float,
+    ):
+        """Apply new bounds in place; in-flight and queued callers are kept."""
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.limit = min(max(self.limit, min_limit), max_limit)
+        self._wake()
+
+    def metrics(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "queued": len(self._waiters),
+            "latency": round(self.latency, 4),
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+    def _wake(self):
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.inflight += 1
+            waiter.set_result(None)
+
+    def _reject(self, status_code: int):
+        logger.warning(f"Shedding request on {self.name}: {self.metrics()}")
+        raise HTTPException(
+            status_code=status_code,
+            detail=f"{self.name} is overloaded",
+            headers={"Retry-After": str(self.retry_after())},
+        )
+
+
+def make_limiter(name: str) -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        name=name,
+        initial_limit=settings.INGEST_INITIAL_LIMIT,
+        min_limit=settings.INGEST_MIN_LIMIT,
+        max_limit=settings.INGEST_MAX_LIMIT,
+        max_queue=settings.INGEST_MAX_QUEUE,
+        queue_timeout=settings.INGEST_QUEUE_TIMEOUT,
+        latency_target=settings.INGEST_LATENCY_TARGET,
+    )
+
+
+ingest_limiters: dict[Topics, AdaptiveLimiter] = {topic: make_limiter(topic.value) for topic in Topics}
+
+
+@on_reload
+def apply_ingest_settings(new_settings: Settings, changed: set[str]):
+    for limiter in ingest_limiters.values():
+        limiter.configure(
+            min_limit=new_settings.INGEST_MIN_LIMIT,
+            max_limit=new_settings.INGEST_MAX_LIMIT,
+            max_queue=new_settings.INGEST_MAX_QUEUE,
+            queue_timeout=new_settings.INGEST_QUEUE_TIMEOUT,
+            latency_target=new_settings.INGEST_LATENCY_TARGET,
+        )
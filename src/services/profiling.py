@@ -0,0 +1,242 @@
+import asyncio
+import functools
+import inspect
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import get_settings
+
+_profile: ContextVar["RequestProfile | None"] = ContextVar("profile", default=None)
+
+
+class RequestProfile:
+    """Phase timings of one sampled request, reported as ``Server-Timing``."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = defaultdict(float)
+        self.handler_started: float | None = None
+        self.endpoint_finished: float | None = None
+
+    def add(self, phase: str, elapsed: float):
+        self.phases[phase] += elapsed
+
+    def server_timing(self) -> str:
+        phases = {**self.phases, "total": time.perf_counter() - self.started}
+        return ", ".join(f"{phase};dur={elapsed * 1000:.2f}" for phase, elapsed in phases.items())
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to ``phase`` of the current request profile, if any."""
+    profile = _profile.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.add(phase, time.perf_counter() - started)
+
+
+class ProfilingMiddleware:
+    """Profiles PROFILE_SAMPLE_RATE of requests, plus any request that sends
+    PROFILE_HEADER from one of PROFILE_ALLOWED_HOSTS.
+
+    Timings are always logged, but only clients in PROFILE_ALLOWED_HOSTS
+    get them back as ``Server-Timing``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        config = get_settings()
+        client = scope.get("client")
+        allowed = client is not None and client[0] in config.PROFILE_ALLOWED_HOSTS
+        header = config.PROFILE_HEADER.lower().encode()
+        if allowed and any(name == header for name, _ in scope["headers"]):
+            sampled = True
+        else:
+            sampled = random.random() < config.PROFILE_SAMPLE_RATE
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                timing = profile.server_timing()
+                if allowed:
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+                logger.info(f"Profile {scope['method']} {scope['path']}: {timing}")
+            await send(message)
+
+        token = _profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _profile.reset(token)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any):
+        profile = _profile.get()
+        if profile is None:
+            return await endpoint(*args, **kwargs)
+
+        started = time.perf_counter()
+        if profile.handler_started is not None:
+            profile.add("validation", started - profile.handler_started)
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            profile.endpoint_finished = time.perf_counter()
+            profile.add("endpoint", profile.endpoint_finished - started)
+
+    setattr(wrapper, "__profiled__", True)
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route that splits a profiled request into validation, endpoint and serialization."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        # include_router builds a new route from the already wrapped endpoint
+        if inspect.iscoroutinefunction(endpoint) and not getattr(endpoint, "__profiled__", False):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            profile = _profile.get()
+            if profile is None:
+                return await handler(request)
+
+            profile.handler_started = time.perf_counter()
+            response = await handler(request)
+            if profile.endpoint_finished is not None:
+                profile.add("serialization", time.perf_counter() - profile.endpoint_finished)
+            return response
+
+        return profiled_handler
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stack of one thread and folds it for flamegraph.pl / speedscope."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+
+_capture_lock = asyncio.Lock()
+
+
+async def capture_loop_profile(seconds: float, interval: float) -> str:
+    """Sample the event loop thread for ``seconds`` and return folded stacks."""
+    if _capture_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already being captured")
+
+    async with _capture_lock:
+        sampler = StackSampler(threading.get_ident(), interval)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(sampler.stop)
+    return sampler.folded()
+
+
+class LoopWatchdog:
+    """Logs the loop thread's stack whenever a callback blocks it for longer than ``threshold``."""
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread = 0
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+    async def start(self):
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def close(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.threshold / 4)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.threshold / 4):
+            beat = self._beat
+            lag = time.monotonic() - beat
+            if lag < self.threshold or reported == beat:
+                continue
+            reported = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms, at:\n{stack}")
@@ -0,0 +1,126 @@
+import asyncio
+import os
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable
+from hashlib import blake2b
+from typing import TypeVar
+from uuid import UUID
+
+from src.config import Settings, on_reload, settings
+from src.services.common import PgUnitOfWork, ReplicaRouter, replica_router
+
+T = TypeVar("T")
+
+POINT_BYTES = 6
+
+
+def key_point(key: str) -> int:
+    """Position of ``key`` on the hash ring."""
+    return int.from_bytes(blake2b(key.encode(), digest_size=POINT_BYTES).digest())
+
+
+def id_point(r_id: UUID) -> int:
+    """Ring position embedded in an id made by ``ShardRouter.new_id``."""
+    return int.from_bytes(r_id.bytes[:POINT_BYTES])
+
+
+class Shard:
+    def __init__(self, name: str, db_url: str, replicas: ReplicaRouter) -> None:
+        self.name = name
+        self.db_url = db_url
+        self.replicas = replicas
+
+    def unit_of_work(self, read_only: bool = False, client_id: str | None = None) -> PgUnitOfWork:
+        return PgUnitOfWork(self.db_url, read_only=read_only, client_id=client_id, router=self.replicas)
+
+    def __repr__(self) -> str:
+        return f"Shard(name={self.name})"
+
+
+class ShardRouter:
+    """Consistent hash ring mapping a shard key (the user's login) to a database.
+
+    Each shard owns ``vnodes`` points on the ring, placed by its name, so
+    adding or removing a shard moves only the keys next to its points.
+    Ids from ``new_id`` start with the key's ring position, which lets
+    lookups by id find the owning shard without knowing the login.
+
+    While users are being moved to a new ring, ``previous`` holds the old
+    one so that keys not moved yet can still be found where they were.
+    """
+
+    def __init__(self, shards: dict[str, str], vnodes: int, previous: dict[str, str] | None = None) -> None:
+        self.shards = [
+            Shard(
+                name,
+                url,
+                replicas=replica_router
+                if url == settings.db_url_postgresql
+                else ReplicaRouter([], replica_router.sticky_seconds, replica_router.health_interval),
+            )
+            for name, url in sorted(shards.items())
+        ]
+        ring = sorted(
+            (key_point(f"{shard.name}#{i}"), index) for index, shard in enumerate(self.shards) for i in range(vnodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [index for _, index in ring]
+        self.previous = ShardRouter(previous, vnodes) if previous else None
+
+    @property
+    def all_shards(self) -> list[Shard]:
+        """Shards of this ring and of the previous one, one per database."""
+        shards = {shard.db_url: shard for shard in self.shards}
+        for shard in self.previous.shards if self.previous is not None else []:
+            shards.setdefault(shard.db_url, shard)
+        return list(shards.values())
+
+    def shard_for_point(self, point: int) -> Shard:
+        index = bisect_right(self._points, point) % len(self._points)
+        return self.shards[self._owners[index]]
+
+    def shard_for_key(self, key: str) -> Shard:
+        return self.shard_for_point(key_point(key))
+
+    def shard_for_id(self, r_id: UUID) -> Shard:
+        return self.shard_for_point(id_point(r_id))
+
+    def previous_for_point(self, point: int) -> Shard | None:
+        """Owner of ``point`` on the previous ring, when a move is running and it differs from the current one."""
+        if self.previous is None:
+            return None
+        shard = self.previous.shard_for_point(point)
+        return None if shard.db_url == self.shard_for_point(point).db_url else shard
+
+    def previous_for_key(self, key: str) -> Shard | None:
+        return self.previous_for_point(key_point(key))
+
+    def previous_for_id(self, r_id: UUID) -> Shard | None:
+        return self.previous_for_point(id_point(r_id))
+
+    @staticmethod
+    def new_id(key: str) -> UUID:
+        """Random version 8 UUID whose first bytes are ``key``'s ring position."""
+        raw = bytearray(key_point(key).to_bytes(POINT_BYTES) + os.urandom(16 - POINT_BYTES))
+        raw[6] = (raw[6] & 0x0F) | 0x80
+        raw[8] = (raw[8] & 0x3F) | 0x80
+        return UUID(bytes=bytes(raw))
+
+    async def scatter(self, func: Callable[[Shard], Awaitable[T]]) -> list[T]:
+        """Run ``func`` on every shard, including those of the previous ring, concurrently."""
+        return await asyncio.gather(*(func(shard) for shard in self.all_shards))
+
+
+shard_router = ShardRouter(
+    settings.PG_SHARDS or {"default": settings.db_url_postgresql},
+    vnodes=settings.PG_SHARD_VNODES,
+    previous=settings.PG_SHARDS_PREVIOUS or None,
+)
+
+
+@on_reload
+def apply_shard_settings(new_settings: Settings, changed: set[str]):
+    # shards other than the primary database have their own replica routers
+    for shard in shard_router.all_shards:
+        shard.replicas.sticky_seconds = new_settings.PG_REPLICA_STICKY_SECONDS
+        shard.replicas.health_interval = new_settings.PG_REPLICA_HEALTH_INTERVAL
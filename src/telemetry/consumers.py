@@ -0,0 +1,59 @@
+import asyncio
+import signal
+from datetime import UTC, datetime
+
+from aiokafka import ConsumerRecord
+from faststream import FastStream
+from faststream.kafka.annotations import KafkaMessage
+from loguru import logger
+
+from src.config import get_settings, reload_settings, settings
+from src.schemas import CarCreate
+from src.services.kafka import broker
+from src.telemetry.services import maintain_partitions, store_car_readings_service
+from src.utils import Topics
+
+app = FastStream(broker)
+
+_maintenance_task: asyncio.Task | None = None
+
+
+def record_time(record: ConsumerRecord) -> datetime:
+    """Time the reading was produced, taken from the Kafka record timestamp."""
+    if record.timestamp is None or record.timestamp < 0:
+        return datetime.now(UTC)
+    return datetime.fromtimestamp(record.timestamp / 1000, UTC)
+
+
+@broker.subscriber(
+    Topics.CAR.value,
+    batch=True,
+    max_records=settings.TELEMETRY_BATCH_SIZE,
+    group_id=settings.GROUP_ID,
+)
+async def store_car_readings(readings: list[CarCreate], message: KafkaMessage):
+    records = [message.raw_message] if isinstance(message.raw_message, ConsumerRecord) else message.raw_message
+    count = await store_car_readings_service(readings, [record_time(record) for record in records])
+    logger.info(f"Stored {count} car readings")
+
+
+async def maintenance_loop():
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception:
+            logger.exception("Telemetry partition maintenance failed")
+        await asyncio.sleep(get_settings().TELEMETRY_MAINTENANCE_INTERVAL)
+
+
+@app.after_startup
+async def start_maintenance():
+    global _maintenance_task
+    _maintenance_task = asyncio.create_task(maintenance_loop())
+    asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_settings)
+
+
+@app.on_shutdown
+async def stop_maintenance():
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
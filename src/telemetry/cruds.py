@@ -0,0 +1,21 @@
+from datetime import datetime
+from uuid import uuid4
+
+from src.schemas import CarCreate
+from src.services.common import CrudEntity, PgUnitOfWork
+from src.telemetry.models import CarReading
+
+COPY_COLUMNS = ("id", "recorded_at", "road_id", "plate_number", "model", "average_speed")
+
+
+class CarReadingCrud(CrudEntity):
+    def __init__(self, uow: PgUnitOfWork):
+        super().__init__(uow=uow, model=CarReading)
+
+    async def bulk_load(self, readings: list[CarCreate], recorded_at: list[datetime]) -> int:
+        records = [
+            (uuid4(), at, reading.road_id, reading.plate_number, reading.model, reading.average_speed)
+            for reading, at in zip(readings, recorded_at, strict=True)
+        ]
+        await self.uow.copy_records(CarReading.__tablename__, records, COPY_COLUMNS)
+        return len(records)
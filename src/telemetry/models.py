@@ -0,0 +1,37 @@
+import re
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import DateTime, Index, PrimaryKeyConstraint, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.user.models import Base
+
+
+class CarReading(Base):
+    """Car sensor reading, range partitioned by ``recorded_at`` into daily partitions."""
+
+    __tablename__ = "car_readings"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "recorded_at"),
+        Index("ix_car_readings_recorded_at_brin", "recorded_at", postgresql_using="brin"),
+        Index("ix_car_readings_road_id_recorded_at", "road_id", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    road_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    plate_number: Mapped[str] = mapped_column(String(length=16), nullable=False)
+    model: Mapped[str] = mapped_column(String(length=100), nullable=False)
+    average_speed: Mapped[int] = mapped_column(nullable=False)
+
+    def __repr__(self) -> str:
+        return f"CarReading(id={self.id}, road_id={self.road_id}, recorded_at={self.recorded_at})"
+
+
+PARTITION_PATTERN = re.compile(rf"^{CarReading.__tablename__}_p(\d{{8}})$")
+
+
+def partition_name(day: date) -> str:
+    return f"{CarReading.__tablename__}_p{day:%Y%m%d}"
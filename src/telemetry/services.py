@@ -0,0 +1,80 @@
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import text
+
+from src.config import get_settings, settings
+from src.schemas import CarCreate
+from src.services.common import PgUnitOfWork
+from src.telemetry.cruds import CarReadingCrud
+from src.telemetry.models import PARTITION_PATTERN, CarReading, partition_name
+
+db_url_postgresql = settings.db_url_postgresql
+
+_known_partitions: set[date] = set()
+
+
+async def ensure_partitions(days: Iterable[date]):
+    """Create daily partitions that are not known to exist yet."""
+    missing = sorted(set(days) - _known_partitions)
+    if not missing:
+        return
+
+    async with PgUnitOfWork(db_url_postgresql) as uow:
+        for day in missing:
+            await uow.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {CarReading.__tablename__} "
+                    f"FOR VALUES FROM ('{day} 00:00:00+00') TO ('{day + timedelta(days=1)} 00:00:00+00')"
+                )
+            )
+        await uow.commit()
+
+    _known_partitions.update(missing)
+
+
+async def drop_expired_partitions(retention_days: int) -> list[str]:
+    oldest = datetime.now(UTC).date() - timedelta(days=retention_days)
+    query = text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    )
+
+    dropped = []
+    async with PgUnitOfWork(db_url_postgresql) as uow:
+        result = await uow.execute(query, {"parent": CarReading.__tablename__})
+        for name in result.scalars():
+            match = PARTITION_PATTERN.match(name)
+            if match is None:
+                continue
+            day = datetime.strptime(match.group(1), "%Y%m%d").date()
+            if day < oldest:
+                await uow.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                _known_partitions.discard(day)
+                dropped.append(name)
+        await uow.commit()
+
+    if dropped:
+        logger.info(f"Dropped expired telemetry partitions: {dropped}")
+    return dropped
+
+
+async def maintain_partitions():
+    config = get_settings()
+    today = datetime.now(UTC).date()
+    await ensure_partitions(today + timedelta(days=i) for i in range(config.TELEMETRY_PARTITION_DAYS_AHEAD + 1))
+    await drop_expired_partitions(config.TELEMETRY_RETENTION_DAYS)
+
+
+async def store_car_readings_service(readings: list[CarCreate], recorded_at: list[datetime]) -> int:
+    """Store ``readings`` under the time each one was produced, creating the partitions they fall into."""
+    await ensure_partitions({at.date() for at in recorded_at})
+
+    async with PgUnitOfWork(db_url_postgresql) as uow:
+        count = await CarReadingCrud(uow=uow).bulk_load(readings, recorded_at)
+        await uow.commit()
+
+    return count
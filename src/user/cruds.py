@@ -33,3 +33,15 @@ class UserCrud(CrudEntity):
         """
 
         return await self.get_entity_by_conditions(conditions=conditions)
+
+    async def list_after(self, after: UUID | None, limit: int) -> list[User]:
+        """Keyset page of users ordered by id, starting after ``after``
+        :param after: last id of the previous page
+        :param limit:
+        :return: list[User]
+        """
+        conditions = [] if after is None else [User.id > after]
+        query = self.select(*conditions).order_by(User.id).limit(limit)
+
+        result = await self.uow.execute(query)
+        return result.scalars().fetchall()  # pyright:ignore[reportReturnType]
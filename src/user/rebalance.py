@@ -0,0 +1,102 @@
+"""Move users onto the shard that owns their login.
+
+Run after changing PG_SHARDS, while the new ring is already serving with
+the old one in PG_SHARDS_PREVIOUS (``{"default": <primary url>}`` when
+coming from a single database), and clear PG_SHARDS_PREVIOUS once it is
+done:
+
+    python -m src.user.rebalance [--dry-run] [--batch-size 500]
+
+Each batch is inserted on the target before it is deleted from the source,
+so an interrupted run leaves duplicates rather than gaps and can simply be
+run again. A user whose login the target already has under another id
+is left where it is and reported as a conflict.
+"""
+
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+
+from loguru import logger
+
+from src.services.sharding import Shard, ShardRouter, shard_router
+from src.user.cruds import UserCrud
+from src.user.models import User
+
+
+async def find_conflicts(target: Shard, users: list[User]) -> list[User]:
+    """Users whose login ``target`` already has under another id."""
+    async with target.unit_of_work() as uow:
+        result = await uow.execute(UserCrud(uow=uow).select(User.login.in_([user.login for user in users])))
+        taken = {user.login: user.id for user in result.scalars()}
+    return [user for user in users if taken.get(user.login, user.id) != user.id]
+
+
+async def move_users(source: Shard, target: Shard, users: list[User]):
+    ids = [user.id for user in users]
+
+    async with target.unit_of_work() as uow:
+        crud = UserCrud(uow=uow)
+        result = await uow.execute(crud.select(User.id.in_(ids)))
+        present = {user.id for user in result.scalars()}
+        for user in users:
+            if user.id not in present:
+                uow.add(User(**{attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}))
+        await uow.flush()
+        await uow.commit()
+
+    async with source.unit_of_work() as uow:
+        await uow.execute(UserCrud(uow=uow).delete(User.id.in_(ids)))
+        await uow.commit()
+
+
+async def rebalance(router: ShardRouter = shard_router, batch_size: int = 500, dry_run: bool = False) -> Counter:
+    """Walk every shard by id and move misplaced users.
+
+    Returns counts per ``source->target``, users left behind because of a
+    login conflict are counted under ``conflicts``.
+    """
+    moved: Counter[str] = Counter()
+
+    for source in router.all_shards:
+        after = None
+        while True:
+            async with source.unit_of_work() as uow:
+                batch = await UserCrud(uow=uow).list_after(after, batch_size)
+            if not batch:
+                break
+            after = batch[-1].id
+
+            misplaced: dict[Shard, list[User]] = defaultdict(list)
+            for user in batch:
+                target = router.shard_for_key(user.login)
+                if target.db_url != source.db_url:
+                    misplaced[target].append(user)
+
+            for target, users in misplaced.items():
+                conflicts = {user.id for user in await find_conflicts(target, users)}
+                if conflicts:
+                    logger.warning(f"Logins of users {sorted(conflicts)} on {source.name} are taken on {target.name}")
+                    moved["conflicts"] += len(conflicts)
+
+                users = [user for user in users if user.id not in conflicts]
+                if users:
+                    moved[f"{source.name}->{target.name}"] += len(users)
+                    if not dry_run:
+                        await move_users(source, target, users)
+
+    logger.info(f"{'Would move' if dry_run else 'Moved'} users: {dict(moved) or 'none'}")
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move users onto the shard that owns their login.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(rebalance(batch_size=args.batch_size, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
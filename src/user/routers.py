@@ -1,36 +1,84 @@
-from fastapi import APIRouter, status
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Query, Request, status
 
 from src.generate_data.car import publish
-from src.schemas import CarCreate, RoadConditionCreate, RoadCreate, SignUp
+from src.schemas import CarCreate, JobState, RoadConditionCreate, RoadCreate, SignUp, UserOut
+from src.services.jobs import jobs
 from src.services.kafka import (
     publish_car_data,
     publish_road_condition_data,
     publish_road_data,
 )
-from src.user.services import create_user_service
+from src.services.profiling import ProfiledRoute
+from src.user.services import create_user_service, get_user_service, import_cars_service, list_users_service
 
 user = APIRouter(
     prefix="/user",
     tags=["user"],
+    route_class=ProfiledRoute,
 )
 
 
+def get_client_id(request: Request, x_client_id: str | None = Header(None)) -> str | None:
+    """Caller identity used to keep reads on the primary right after its writes."""
+    if x_client_id is not None:
+        return x_client_id
+    return request.client.host if request.client is not None else None
+
+
 @user.post(
     "/sign-up",
     status_code=status.HTTP_201_CREATED,
 )
 async def sign_up(
     payload: SignUp,
+    client_id: str | None = Depends(get_client_id),
+):
+    return await create_user_service(payload, client_id=client_id)
+
+
+@user.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=list[UserOut],
+)
+async def list_users(
+    after: UUID | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    client_id: str | None = Depends(get_client_id),
+):
+    return await list_users_service(after, limit, client_id=client_id)
+
+
+@user.get(
+    "/{user_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=UserOut,
+)
+async def get_user(
+    user_id: UUID,
+    client_id: str | None = Depends(get_client_id),
 ):
-    return await create_user_service(payload)
+    return await get_user_service(user_id, client_id=client_id)
 
 
 @user.post(
     "/publish",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def publish_data() -> JobState:
+    return await jobs.submit("generate-cars", lambda job: publish(job.set_progress))
+
+
+@user.post(
+    "/import-cars",
+    status_code=status.HTTP_202_ACCEPTED,
 )
-async def publish_data():
-    return await publish()
+async def import_cars(
+    payload: list[CarCreate],
+) -> JobState:
+    return await jobs.submit("import-cars", lambda job: import_cars_service(payload, job.set_progress))
 
 
 @user.post(
@@ -1,15 +1,88 @@
-from src.config import settings
-from src.schemas import SignUp
-from src.services.common import PgUnitOfWork
+import asyncio
+import heapq
+from itertools import groupby, islice
+from collections.abc import Awaitable, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from src.schemas import CarCreate, GetUser, SignUp
+from src.services.kafka import publish_message
+from src.services.sharding import Shard, shard_router
 from src.user.cruds import UserCrud
+from src.user.models import User
+from src.utils import Topics
+
 
-db_url_postgresql = settings.db_url_postgresql
+async def create_user_service(payload: SignUp, client_id: str | None = None):
+    login = payload.user.login
+    body = payload.user.model_dump()
+    body["id"] = shard_router.new_id(login)
 
+    # logins are unique per database, while users are moving the old owner may still have it
+    previous = shard_router.previous_for_key(login)
+    if previous is not None and await find_login(previous, login, client_id) is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Key (login)=({login}) already exists")
 
-async def create_user_service(payload: SignUp):
-    async with PgUnitOfWork(db_url_postgresql) as uow:
-        user = await UserCrud(uow=uow).create_user(payload.user)
+    async with shard_router.shard_for_key(login).unit_of_work(client_id=client_id) as uow:
+        user = await UserCrud(uow=uow).create_user(body)
 
         await uow.commit()
 
     return user
+
+
+async def find_user(shard: Shard, r_id: UUID, client_id: str | None = None) -> User | None:
+    async with shard.unit_of_work(read_only=True, client_id=client_id) as uow:
+        return await UserCrud(uow=uow).one_or_none(GetUser(id=r_id))
+
+
+async def find_login(shard: Shard, login: str, client_id: str | None = None) -> User | None:
+    async with shard.unit_of_work(read_only=True, client_id=client_id) as uow:
+        result = await uow.execute(UserCrud(uow=uow).select(User.login == login))
+        return result.scalar_one_or_none()
+
+
+async def get_user_service(r_id: UUID, client_id: str | None = None):
+    owner = shard_router.shard_for_id(r_id)
+    user = await find_user(owner, r_id, client_id)
+
+    if user is None and r_id.version == 8:
+        # not moved to its new owner yet
+        previous = shard_router.previous_for_id(r_id)
+        if previous is not None:
+            user = await find_user(previous, r_id, client_id)
+    elif user is None:
+        # ids created before sharding don't carry their shard, ask the rest
+        others = [shard for shard in shard_router.all_shards if shard.db_url != owner.db_url]
+        found = await asyncio.gather(*(find_user(shard, r_id, client_id) for shard in others))
+        user = next((u for u in found if u is not None), None)
+
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No such object")
+    return user
+
+
+async def list_users_service(after: UUID | None, limit: int, client_id: str | None = None) -> list[User]:
+    async def page(shard: Shard) -> list[User]:
+        async with shard.unit_of_work(read_only=True, client_id=client_id) as uow:
+            return await UserCrud(uow=uow).list_after(after, limit)
+
+    pages = await shard_router.scatter(page)
+    # a user being moved can briefly be on two shards
+    merged = heapq.merge(*pages, key=lambda user: user.id)
+    unique = (next(group) for _, group in groupby(merged, key=lambda user: user.id))
+    return list(islice(unique, limit))
+
+
+async def import_cars_service(
+    payload: list[CarCreate],
+    on_progress: Callable[[float], Awaitable[None]],
+    progress_every: int = 100,
+) -> int:
+    for i, car in enumerate(payload, start=1):
+        await publish_message(car, Topics.CAR)
+        if i % progress_every == 0:
+            await on_progress(i / len(payload))
+
+    return len(payload)
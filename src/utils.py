@@ -39,6 +39,16 @@ class Topics(Enum):
     ROAD_CONDITION = "RoadCondition"
 
 
+class JobStatus(str, Enum):
+    """Background job lifecycle."""
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
 class Sort(Enum):
     ASC = "asc"
     DESC = "desc"
@@ -0,0 +1,21 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.user.models import User
+
+
+@pytest.fixture
+def sqlite_db(tmp_path: Path) -> Callable[[str], str]:
+    """Create a sqlite file with the users table and return its async url."""
+
+    def make(name: str) -> str:
+        path = tmp_path / f"{name}.db"
+        engine = create_engine(f"sqlite:///{path}")
+        User.__table__.create(engine)  # pyright: ignore[reportAttributeAccessIssue]
+        engine.dispose()
+        return f"sqlite+aiosqlite:///{path}"
+
+    return make
@@ -0,0 +1,176 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+import time_machine
+from fastapi import HTTPException
+
+from src.services.jobs import Job, JobManager, MemoryJobStore
+from src.utils import JobStatus
+
+
+def make_manager(store: MemoryJobStore | None = None, max_running: int = 1, max_pending: int = 1) -> JobManager:
+    return JobManager(store=store or MemoryJobStore(ttl=60), max_running=max_running, max_pending=max_pending)
+
+
+async def finish(manager: JobManager, job_id: UUID):
+    task = manager._tasks.get(job_id)
+    if task is not None:
+        await asyncio.wait_for(task, timeout=1)
+
+
+def blocker(release: asyncio.Event, started: list[UUID] | None = None):
+    async def run(job: Job):
+        if started is not None:
+            started.append(job.state.id)
+        await release.wait()
+        await job.set_progress(0.5)
+        return "released"
+
+    return run
+
+
+def test_job_reports_progress_and_result():
+    async def scenario():
+        manager = make_manager()
+        seen = []
+
+        async def work(job: Job):
+            await job.set_progress(0.5)
+            seen.append((await manager.get(job.state.id)).progress)
+            return 42
+
+        state = await manager.submit("work", work)
+        assert state.status == JobStatus.PENDING
+        await finish(manager, state.id)
+
+        done = await manager.get(state.id)
+        assert seen == [0.5]
+        assert (done.status, done.progress, done.result) == (JobStatus.DONE, 1.0, 42)
+
+    asyncio.run(scenario())
+
+
+def test_failed_job_keeps_the_error():
+    async def scenario():
+        manager = make_manager()
+
+        async def work(job: Job):
+            raise ValueError("boom")
+
+        state = await manager.submit("work", work)
+        await finish(manager, state.id)
+
+        failed = await manager.get(state.id)
+        assert failed.status == JobStatus.FAILED
+        assert failed.error == "ValueError('boom')"
+
+    asyncio.run(scenario())
+
+
+def test_pending_cap_counts_only_jobs_without_a_slot():
+    async def scenario():
+        manager = make_manager(max_running=1, max_pending=1)
+        release = asyncio.Event()
+
+        running = await manager.submit("a", blocker(release))
+        waiting = await manager.submit("b", blocker(release))
+        assert manager.pending == 1
+        with pytest.raises(HTTPException) as exc:
+            await manager.submit("c", blocker(release))
+        assert exc.value.status_code == 429
+
+        release.set()
+        await finish(manager, running.id)
+        await finish(manager, waiting.id)
+        assert manager.pending == 0
+        assert (await manager.get(waiting.id)).status == JobStatus.DONE
+
+    asyncio.run(scenario())
+
+
+def test_local_cancel_stops_a_running_job():
+    async def scenario():
+        manager = make_manager()
+        started = []
+        state = await manager.submit("work", blocker(asyncio.Event(), started))
+        while not started:
+            await asyncio.sleep(0)
+
+        await manager.cancel(state.id)
+        await finish(manager, state.id)
+        assert (await manager.get(state.id)).status == JobStatus.CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_cancel_from_another_worker_while_pending():
+    async def scenario():
+        store = MemoryJobStore(ttl=60)
+        owner, other = make_manager(store), make_manager(store)
+        release = asyncio.Event()
+        started = []
+
+        first = await owner.submit("a", blocker(release, started))
+        queued = await owner.submit("b", blocker(release, started))
+        await asyncio.sleep(0)
+
+        cancelled = await other.cancel(queued.id)
+        assert cancelled.cancel_requested
+
+        release.set()
+        await finish(owner, first.id)
+        await finish(owner, queued.id)
+
+        assert started == [first.id]
+        state = await other.get(queued.id)
+        assert state.status == JobStatus.CANCELLED
+        assert state.cancel_requested
+
+    asyncio.run(scenario())
+
+
+def test_cancel_from_another_worker_while_running():
+    async def scenario():
+        store = MemoryJobStore(ttl=60)
+        owner, other = make_manager(store), make_manager(store)
+        release = asyncio.Event()
+        started = []
+
+        state = await owner.submit("a", blocker(release, started))
+        while not started:
+            await asyncio.sleep(0)
+
+        await other.cancel(state.id)
+        release.set()
+        await finish(owner, state.id)
+        assert (await other.get(state.id)).status == JobStatus.CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_expire_after_ttl():
+    async def scenario():
+        manager = make_manager(MemoryJobStore(ttl=60), max_running=2)
+        release = asyncio.Event()
+
+        async def work(job: Job):
+            return None
+
+        with time_machine.travel(datetime.now(UTC), tick=False) as traveller:
+            done = await manager.submit("done", work)
+            await finish(manager, done.id)
+            running = await manager.submit("running", blocker(release))
+
+            traveller.shift(timedelta(seconds=61))
+            await manager.submit("trigger", work)
+
+            with pytest.raises(HTTPException):
+                await manager.get(done.id)
+            assert (await manager.get(running.id)).status not in {JobStatus.DONE, JobStatus.CANCELLED}
+
+            release.set()
+            await finish(manager, running.id)
+
+    asyncio.run(scenario())
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.limiter import AdaptiveLimiter
+
+
+def make_limiter(**kwargs) -> AdaptiveLimiter:
+    options = {
+        "initial_limit": 1,
+        "min_limit": 1,
+        "max_limit": 10,
+        "max_queue": 1,
+        "queue_timeout": 1.0,
+        "latency_target": 0.5,
+    }
+    return AdaptiveLimiter("test", **{**options, **kwargs})
+
+
+async def hold(limiter: AdaptiveLimiter, release: asyncio.Event):
+    async with limiter.slot():
+        await release.wait()
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        limiter = make_limiter()
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(limiter, release))
+        waiter = asyncio.create_task(hold(limiter, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc:
+            await limiter.acquire()
+        assert exc.value.status_code == 429
+        assert exc.value.headers is not None and int(exc.value.headers["Retry-After"]) >= 1
+        assert limiter.shed_queue_full == 1
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert limiter.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_is_rejected_with_503():
+    async def scenario():
+        limiter = make_limiter(queue_timeout=0.01)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(limiter, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc:
+            await limiter.acquire()
+        assert exc.value.status_code == 503
+        assert "Retry-After" in (exc.value.headers or {})
+        assert limiter.shed_timeout == 1
+        assert limiter.metrics()["queued"] == 0
+
+        release.set()
+        await holder
+        assert limiter.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slow_and_failed_calls_back_off():
+    limiter = make_limiter(initial_limit=8, latency_target=0.1)
+
+    limiter.inflight = 1
+    limiter.release(0.5)
+    assert limiter.limit == pytest.approx(8 * 0.9)
+
+    limiter.inflight = 1
+    limiter.release(0.01, failed=True)
+    assert limiter.limit == pytest.approx(8 * 0.9 * 0.9)
+
+
+def test_backoff_stops_at_min_limit():
+    limiter = make_limiter(initial_limit=2, min_limit=2)
+    limiter.inflight = 1
+    limiter.release(0.01, failed=True)
+    assert limiter.limit == 2
+
+
+def test_fast_calls_increase_additively_up_to_max():
+    limiter = make_limiter(initial_limit=4, max_limit=5)
+
+    limiter.inflight = 1
+    limiter.release(0.01)
+    assert limiter.limit == pytest.approx(4.25)
+
+    for _ in range(10):
+        limiter.inflight = 1
+        limiter.release(0.01)
+    assert limiter.limit == 5
+
+
+def test_failure_inside_slot_is_counted_and_released():
+    async def scenario():
+        limiter = make_limiter(initial_limit=4)
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError
+        assert limiter.inflight == 0
+        assert limiter.limit == pytest.approx(4 * 0.9)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        limiter = make_limiter(max_queue=2)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(limiter, release))
+        await asyncio.sleep(0)
+
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert limiter.metrics()["queued"] == 0
+
+        release.set()
+        await holder
+        assert limiter.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiter_cancelled_while_being_granted_hands_the_slot_on():
+    async def scenario():
+        limiter = make_limiter(max_limit=1, max_queue=2)
+        await limiter.acquire()
+
+        granted_then_cancelled = asyncio.create_task(limiter.acquire())
+        next_in_line = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # the release hands the slot over, then the caller goes away before it runs
+        limiter.release(0.01)
+        granted_then_cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await granted_then_cancelled
+
+        await asyncio.wait_for(next_in_line, timeout=1)
+        assert limiter.inflight == 1
+        limiter.release(0.01)
+        assert limiter.inflight == 0
+
+    asyncio.run(scenario())
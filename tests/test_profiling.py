@@ -0,0 +1,50 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import reload_settings
+from src.services.profiling import ProfiledRoute, ProfilingMiddleware, span
+
+
+@pytest.fixture
+def profile_settings():
+    def apply(**values: str):
+        os.environ.update(values)
+        reload_settings()
+
+    yield apply
+    for name in ("PROFILE_SAMPLE_RATE", "PROFILE_ALLOWED_HOSTS"):
+        os.environ.pop(name, None)
+    reload_settings()
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.router.route_class = ProfiledRoute
+
+    @app.get("/")
+    async def index():
+        with span("db"):
+            return {}
+
+    return TestClient(app)
+
+
+def test_sampled_requests_only_show_timings_to_allowed_hosts(profile_settings):
+    profile_settings(PROFILE_SAMPLE_RATE="1", PROFILE_ALLOWED_HOSTS='["127.0.0.1"]')
+    assert "server-timing" not in make_client().get("/").headers
+
+    profile_settings(PROFILE_SAMPLE_RATE="1", PROFILE_ALLOWED_HOSTS='["testclient"]')
+    timing = make_client().get("/").headers["server-timing"]
+    assert "db;dur=" in timing and "total;dur=" in timing
+
+
+def test_profile_header_is_honoured_only_from_allowed_hosts(profile_settings):
+    profile_settings(PROFILE_SAMPLE_RATE="0", PROFILE_ALLOWED_HOSTS='["127.0.0.1"]')
+    assert "server-timing" not in make_client().get("/", headers={"X-Profile": "1"}).headers
+
+    profile_settings(PROFILE_SAMPLE_RATE="0", PROFILE_ALLOWED_HOSTS='["testclient"]')
+    assert "server-timing" in make_client().get("/", headers={"X-Profile": "1"}).headers
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from uuid import UUID
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.schemas import GetUser
+from src.services.common import LAST_WRITE_COOKIE, PgUnitOfWork, ReadYourWritesMiddleware, ReplicaRouter
+from src.user.cruds import UserCrud
+from src.utils import UserRole
+
+
+def user_body(login: str) -> dict:
+    return {"login": login, "username": login, "password": "password", "role": UserRole.STUDENT}
+
+
+async def create_user(primary: str, router: ReplicaRouter, client_id: str):
+    async with PgUnitOfWork(primary, client_id=client_id, router=router) as uow:
+        user = await UserCrud(uow=uow).create_user(user_body("replicated"))
+        await uow.commit()
+    return user.id
+
+
+async def read_user(primary: str, router: ReplicaRouter, client_id: str, r_id):
+    async with PgUnitOfWork(primary, read_only=True, client_id=client_id, router=router) as uow:
+        return await UserCrud(uow=uow).one_or_none(GetUser(id=r_id))
+
+
+def test_reads_go_to_replica_except_right_after_a_write(sqlite_db):
+    primary, replica = sqlite_db("primary"), sqlite_db("replica")
+    router = ReplicaRouter([replica], sticky_seconds=60, health_interval=1)
+
+    async def scenario():
+        r_id = await create_user(primary, router, client_id="writer")
+        # the replica file never receives the write, so finding the user means the read hit the primary
+        assert await read_user(primary, router, "writer", r_id) is not None
+        assert await read_user(primary, router, "reader", r_id) is None
+
+        router.sticky_seconds = 0
+        assert await read_user(primary, router, "writer", r_id) is None
+
+    asyncio.run(scenario())
+
+
+def test_unhealthy_replica_falls_back_to_primary(sqlite_db, tmp_path):
+    primary = sqlite_db("primary")
+    router = ReplicaRouter([f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db"], sticky_seconds=0, health_interval=1)
+
+    async def scenario():
+        r_id = await create_user(primary, router, client_id="writer")
+        await router.check()
+        assert not router.replicas[0].healthy
+        assert await read_user(primary, router, "reader", r_id) is not None
+
+    asyncio.run(scenario())
+
+
+def test_least_busy_replica_is_chosen():
+    router = ReplicaRouter(
+        ["sqlite+aiosqlite:///a.db", "sqlite+aiosqlite:///b.db"],
+        sticky_seconds=0,
+        health_interval=1,
+    )
+    first, second = router.replicas
+    first.connections = 2
+
+    assert router.choose() is second
+    second.healthy = False
+    assert router.choose() is first
+
+
+def test_last_write_cookie_keeps_reads_on_primary_across_workers(sqlite_db):
+    primary, replica = sqlite_db("primary"), sqlite_db("replica")
+    # one router per worker process, neither sees the other's in-memory writes
+    writer_worker = ReplicaRouter([replica], sticky_seconds=60, health_interval=1)
+    reader_worker = ReplicaRouter([replica], sticky_seconds=60, health_interval=1)
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/users")
+    async def write():
+        return str(await create_user(primary, writer_worker, client_id=None))
+
+    @app.get("/users/{r_id}")
+    async def read(r_id: UUID):
+        return await read_user(primary, reader_worker, None, r_id) is not None
+
+    client = TestClient(app)
+    r_id = client.post("/users").json()
+    assert LAST_WRITE_COOKIE in client.cookies
+    assert client.get(f"/users/{r_id}").json() is True
+
+    client.cookies.clear()
+    assert client.get(f"/users/{r_id}").json() is False
+
+    client.cookies.set(LAST_WRITE_COOKIE, str(time.time() + 3600))
+    assert client.get(f"/users/{r_id}").json() is False
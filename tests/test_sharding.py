@@ -0,0 +1,169 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from src.config import Settings
+from src.schemas import CreateUser, SignUp
+from src.services import sharding
+from src.services.sharding import Shard, ShardRouter
+from src.user import services
+from src.user.models import User
+from src.user.rebalance import rebalance
+from src.utils import UserRole
+
+LOGINS = [f"user-{i:03}" for i in range(60)]
+
+
+def make_user(r_id: uuid.UUID, login: str) -> User:
+    return User(
+        id=r_id,
+        login=login,
+        username=login,
+        password="password",
+        role=UserRole.STUDENT,
+        created_at=datetime.now(UTC),
+    )
+
+
+async def add_users(shard: Shard, users: list[User]):
+    async with shard.unit_of_work() as uow:
+        for user in users:
+            uow.add(user)
+        await uow.commit()
+
+
+async def logins_on(shard: Shard) -> set[str]:
+    async with shard.unit_of_work() as uow:
+        return set((await uow.execute(select(User.login))).scalars())
+
+
+async def count_on(shard: Shard) -> int:
+    async with shard.unit_of_work() as uow:
+        return (await uow.execute(select(func.count()).select_from(User))).scalar_one()
+
+
+def test_new_id_points_at_the_login_shard(sqlite_db):
+    router = ShardRouter({name: sqlite_db(name) for name in ("a", "b", "c")}, vnodes=16)
+
+    for login in LOGINS:
+        r_id = router.new_id(login)
+        assert r_id.version == 8
+        assert router.shard_for_id(r_id) is router.shard_for_key(login)
+
+    assert len({router.shard_for_key(login).name for login in LOGINS}) == 3
+
+
+def test_rebalance_moves_users_onto_new_ring(sqlite_db):
+    urls = {name: sqlite_db(name) for name in ("a", "b", "c")}
+    old = ShardRouter({name: urls[name] for name in ("a", "b")}, vnodes=16)
+    new = ShardRouter(urls, vnodes=16)
+
+    async def scenario():
+        for login in LOGINS:
+            await add_users(old.shard_for_key(login), [make_user(old.new_id(login), login)])
+
+        planned = await rebalance(new, batch_size=7, dry_run=True)
+        assert sum([await count_on(shard) for shard in old.shards]) == len(LOGINS)
+        assert await count_on(new.shards[2]) == 0
+
+        moved = await rebalance(new, batch_size=7)
+        assert moved == planned
+        assert sum(moved.values()) > 0
+        assert all(key.endswith("->c") for key in moved)
+
+        for shard in new.shards:
+            assert await logins_on(shard) == {login for login in LOGINS if new.shard_for_key(login) is shard}
+
+        assert not await rebalance(new, batch_size=7)
+
+    asyncio.run(scenario())
+
+
+def test_lookup_falls_back_only_for_legacy_ids(sqlite_db, monkeypatch):
+    router = ShardRouter({name: sqlite_db(name) for name in ("a", "b")}, vnodes=16)
+    monkeypatch.setattr(services, "shard_router", router)
+    first, second = router.shards
+
+    def elsewhere(r_id: uuid.UUID) -> Shard:
+        return second if router.shard_for_id(r_id) is first else first
+
+    legacy = uuid.uuid4()
+    misplaced = router.new_id("misplaced")
+
+    async def scenario():
+        # both live off their ring position, only the legacy one may be found by asking every shard
+        await add_users(elsewhere(legacy), [make_user(legacy, "legacy")])
+        await add_users(elsewhere(misplaced), [make_user(misplaced, "misplaced")])
+
+        assert (await services.get_user_service(legacy)).login == "legacy"
+        with pytest.raises(HTTPException) as exc:
+            await services.get_user_service(misplaced)
+        assert exc.value.status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_reload_reaches_every_shard_replica_router(sqlite_db, monkeypatch):
+    router = ShardRouter({name: sqlite_db(name) for name in ("a", "b")}, vnodes=16)
+    monkeypatch.setattr(sharding, "shard_router", router)
+
+    sharding.apply_shard_settings(
+        Settings(PG_REPLICA_STICKY_SECONDS=1.5, PG_REPLICA_HEALTH_INTERVAL=2.5),
+        {"PG_REPLICA_STICKY_SECONDS", "PG_REPLICA_HEALTH_INTERVAL"},
+    )
+
+    for shard in router.shards:
+        assert shard.replicas.sticky_seconds == 1.5
+        assert shard.replicas.health_interval == 2.5
+
+
+def test_users_stay_reachable_and_unique_while_moving(sqlite_db, monkeypatch):
+    urls = {name: sqlite_db(name) for name in ("a", "b", "c")}
+    old_ring = {name: urls[name] for name in ("a", "b")}
+    old = ShardRouter(old_ring, vnodes=16)
+    moving = ShardRouter(urls, vnodes=16, previous=old_ring)
+    monkeypatch.setattr(services, "shard_router", moving)
+
+    movers = [login for login in LOGINS if moving.previous_for_key(login) is not None]
+    moved, duplicated = movers[0], movers[1]
+    staying = next(login for login in LOGINS if moving.previous_for_key(login) is None)
+
+    def sign_up(login: str) -> SignUp:
+        return SignUp(user=CreateUser(login=login, password="password", username=login, role=UserRole.STUDENT))
+
+    async def scenario():
+        ids = {}
+        for login in LOGINS:
+            ids[login] = old.new_id(login)
+            await add_users(old.shard_for_key(login), [make_user(ids[login], login)])
+        # signed up on the new owner before sign-up checked the previous ring
+        await add_users(moving.shard_for_key(duplicated), [make_user(moving.new_id(duplicated), duplicated)])
+
+        # the new owner doesn't have it yet, the previous one answers
+        assert (await services.get_user_service(ids[moved])).login == moved
+        assert (await services.get_user_service(ids[staying])).login == staying
+
+        for login in (moved, staying):
+            with pytest.raises(HTTPException) as exc:
+                await services.create_user_service(sign_up(login))
+            assert exc.value.status_code == 400
+
+        listed = await services.list_users_service(None, limit=len(LOGINS) + 10)
+        assert len(listed) == len(LOGINS) + 1
+
+        result = await rebalance(moving, batch_size=7)
+        assert result["conflicts"] == 1
+        assert await logins_on(old.shard_for_key(duplicated)) >= {duplicated}
+
+        assert (await services.get_user_service(ids[moved])).login == moved
+        assert moved in await logins_on(moving.shard_for_key(moved))
+        assert moved not in await logins_on(old.shard_for_key(moved))
+
+        again = await rebalance(moving, batch_size=7)
+        assert dict(again) == {"conflicts": 1}
+
+    asyncio.run(scenario())